@@ -157,8 +157,9 @@ class Definition:
             if patch.newname != "":
                 # Find all residues matching applyto
                 resnames = list(self.map.keys())
+                pattern = re.compile(patch.applyto)
                 for name in resnames:
-                    regexp = re.compile(patch.applyto).match(name)
+                    regexp = pattern.match(name)
                     if not regexp:
                         continue
                     newname = patch.newname.replace("*", name)
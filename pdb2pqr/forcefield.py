@@ -74,10 +74,10 @@ class ForcefieldHandler(sax.ContentHandler):
         :rtype:  [re.Match]
         """
         name_list = []
-        regname += "$"
+        pattern = re.compile(regname + "$")
         # Find the existing items that match this string
         for name in map_:
-            regexp = re.compile(regname).match(name)
+            regexp = pattern.match(name)
             if regexp:
                 name_list.append(regexp)
         return name_list
@@ -242,7 +242,7 @@ class Forcefield:
             raise ValueError("Unable to identify .names file.")
         handler = ForcefieldHandler(self.map, definition.map)
         sax.make_parser()
-        with open(names_path, "rt", encoding="utf-8") as namesfile:
+        with open(names_path, "rb") as namesfile:
             sax.parseString(namesfile.read(), handler)
 
     def has_residue(self, resname):
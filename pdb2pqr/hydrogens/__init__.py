@@ -71,7 +71,7 @@ def create_handler(hyd_path=HYD_DEF_PATH):
     """
     handler = HydrogenHandler()
     hyd_path = io.test_dat_file(hyd_path)
-    with open(hyd_path, "rt") as hyd_file:
+    with open(hyd_path, "rb") as hyd_file:
         sax.make_parser()
         sax.parseString(hyd_file.read(), handler)
     return handler
@@ -1,24 +1,63 @@
 """Functions related to reading and writing data."""
+import functools
 import logging
 import io
+import os
+import re
 
 # import argparse
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from sys import path as sys_path
+import numpy as np
 import requests
 from . import psize
 from . import inputgen
 from . import cif
 from . import pdb
 from . import definitions as defns
-from .structures import Atom
+from .structures import Atom, split_pqr_line
 from .config import FORCE_FIELDS, TITLE_STR
 from .config import FILTER_WARNINGS_LIMIT, FILTER_WARNINGS
 from .config import AA_DEF_PATH, NA_DEF_PATH, PATCH_DEF_PATH
 
 
 _LOGGER = logging.getLogger(__name__)
+#: Directory with the data files distributed with PDB2PQR
+DAT_PATH = Path(__file__).parent / "dat"
+#: Names of the files in :data:`DAT_PATH`, scanned once at import
+_DAT_FILES = frozenset(
+    entry.name for entry in os.scandir(DAT_PATH) if entry.is_file()
+)
+#: Start of the first metadata line after the values in a DX file; grid
+#: values such as ``nan`` and ``inf`` also start with a letter, so the
+#: trailer is found by keyword
+_DX_TRAILER = re.compile(
+    r"^[ \t]*(?:#|attribute|component|object|origin|delta)(?=\s)",
+    re.MULTILINE,
+)
+#: Number of Cube value lines formatted per write
+_CUBE_ROWS_PER_WRITE = 1 << 16
+#: HTTP session shared by downloads so connections to RCSB are reused
+_SESSION = requests.Session()
+#: Timeout (seconds) for connecting to and reading from the PDB server
+_DOWNLOAD_TIMEOUT = 30
+#: PDB record types that make up the original header
+_HEADER_TYPES = (
+    pdb.HEADER,
+    pdb.TITLE,
+    pdb.COMPND,
+    pdb.SOURCE,
+    pdb.KEYWDS,
+    pdb.EXPDTA,
+    pdb.AUTHOR,
+    pdb.REVDAT,
+    pdb.JRNL,
+    pdb.REMARK,
+    pdb.SPRSDE,
+    pdb.NUMMDL,
+)
 
 
 class DuplicateFilter(logging.Filter):
@@ -27,22 +66,24 @@ class DuplicateFilter(logging.Filter):
     def __init__(self):
         super().__init__()
         self.warn_count = Counter()
+        self._prefixes = tuple(FILTER_WARNINGS)
 
     def filter(self, record):
         """Filter current record."""
-        if record.levelname == "WARNING":
-            for fwarn in FILTER_WARNINGS:
-                if record.getMessage().startswith(fwarn):
-                    self.warn_count.update([fwarn])
-                    if self.warn_count[fwarn] > FILTER_WARNINGS_LIMIT:
-                        return False
-                    elif self.warn_count[fwarn] == FILTER_WARNINGS_LIMIT:
-                        _LOGGER.warning(
-                            f'Suppressing further "{fwarn}" messages'
-                        )
-                        return False
-                    else:
-                        return True
+        if record.levelname != "WARNING":
+            return True
+        message = record.getMessage()
+        if not message.startswith(self._prefixes):
+            return True
+        fwarn = next(
+            prefix for prefix in self._prefixes if message.startswith(prefix)
+        )
+        self.warn_count[fwarn] += 1
+        if self.warn_count[fwarn] > FILTER_WARNINGS_LIMIT:
+            return False
+        elif self.warn_count[fwarn] == FILTER_WARNINGS_LIMIT:
+            _LOGGER.warning(f'Suppressing further "{fwarn}" messages')
+            return False
         return True
 
 
@@ -54,20 +95,28 @@ def print_biomolecule_atoms(atomlist, chainflag=False, pdbfile=False):
     :return:  list of strings, each representing an atom PDB line
     :rtype:  [str]
     """
-    text = []
-    currentchain_id = None
+    # "TER" records go between chains; a chain ID following a None chain ID
+    # does not start a new chain
+    chain_ids = [atom.chain_id for atom in atomlist]
+    ter_positions = {
+        iatom
+        for iatom in range(1, len(chain_ids))
+        if chain_ids[iatom - 1] is not None
+        and chain_ids[iatom] != chain_ids[iatom - 1]
+    }
     for iatom, atom in enumerate(atomlist):
-        # Print the "TER" records between chains
-        if currentchain_id is None:
-            currentchain_id = atom.chain_id
-        elif atom.chain_id != currentchain_id:
-            currentchain_id = atom.chain_id
-            text.append("TER\n")
         atom.serial = iatom + 1
-        if pdbfile is True:
-            text.append(f"{atom.get_pdb_string()}\n")
-        else:
-            text.append(f"{atom.get_pqr_string(chainflag=chainflag)}\n")
+    if pdbfile is True:
+        atom_lines = [atom.get_pdb_string() for atom in atomlist]
+    else:
+        atom_lines = [
+            atom.get_pqr_string(chainflag=chainflag) for atom in atomlist
+        ]
+    text = []
+    for iatom, line in enumerate(atom_lines):
+        if iatom in ter_positions:
+            text.append("TER\n")
+        text.append(line + "\n")
     text.append("TER\nEND")
     return text
 
@@ -80,27 +129,12 @@ def get_old_header(pdblist):
     :return:  old header as string
     :rtype:  str
     """
-    old_header = io.StringIO()
-    header_types = (
-        pdb.HEADER,
-        pdb.TITLE,
-        pdb.COMPND,
-        pdb.SOURCE,
-        pdb.KEYWDS,
-        pdb.EXPDTA,
-        pdb.AUTHOR,
-        pdb.REVDAT,
-        pdb.JRNL,
-        pdb.REMARK,
-        pdb.SPRSDE,
-        pdb.NUMMDL,
-    )
+    parts = []
     for pdb_obj in pdblist:
-        if not isinstance(pdb_obj, header_types):
+        if not isinstance(pdb_obj, _HEADER_TYPES):
             break
-        old_header.write(str(pdb_obj))
-        old_header.write("\n")
-    return old_header.getvalue()
+        parts.append(str(pdb_obj))
+    return "\n".join(parts) + ("\n" if parts else "")
 
 
 def print_pqr_header(
@@ -139,76 +173,60 @@ def print_pqr_header(
         force_field = "User force field"
     else:
         force_field = force_field.upper()
-    head = "\n".join(
-        [
-            "REMARK   1 PQR file generated by PDB2PQR",
-            f"REMARK   1 {TITLE_STR}",
-            "REMARK   1",
-            f"REMARK   1 Forcefield Used: {force_field}",
-            "",
-        ]
-    )
+    parts = [
+        "REMARK   1 PQR file generated by PDB2PQR\n",
+        f"REMARK   1 {TITLE_STR}\n",
+        "REMARK   1\n",
+        f"REMARK   1 Forcefield Used: {force_field}\n",
+    ]
     if ffout is not None:
-        head += f"REMARK   1 Naming Scheme Used: {ffout}\n"
-    head += head + "REMARK   1\n"
+        parts.append(f"REMARK   1 Naming Scheme Used: {ffout}\n")
+    parts.append("REMARK   1\n")
     if ph_calc_method is not None:
-        head += "\n".join(
-            [
-                f"REMARK   1 pKas calculated by {ph_calc_method} and "
-                f"assigned using pH {ph:.2f}\n"
-                "REMARK   1",
-                "",
-            ]
+        parts.append(
+            f"REMARK   1 pKas calculated by {ph_calc_method} and "
+            f"assigned using pH {ph:.2f}\n"
+            "REMARK   1\n"
         )
     if len(atomlist) != 0:
-        head += "\n".join(
-            [
-                "REMARK   5 WARNING: PDB2PQR was unable to assign charges",
-                "REMARK   5 to the following atoms (omitted below):",
-                "",
-            ]
+        parts.append(
+            "REMARK   5 WARNING: PDB2PQR was unable to assign charges\n"
+            "REMARK   5 to the following atoms (omitted below):\n"
         )
         for atom in atomlist:
-            head += f"REMARK   5    {atom.serial} {atom.name} in "
-            head += f"{atom.residue.name} {atom.residue.res_seq}\n"
-        head += "\n".join(
-            [
-                "REMARK   5 This is usually due to the fact that this residue "
-                "is not",
-                "REMARK   5 an amino acid or nucleic acid; or, there are no "
-                "parameters",
-                "REMARK   5 available for the specific protonation state of "
-                "this",
-                "REMARK   5 residue in the selected forcefield.",
-                "REMARK   5",
-                "",
-            ]
+            parts.append(
+                f"REMARK   5    {atom.serial} {atom.name} in "
+                f"{atom.residue.name} {atom.residue.res_seq}\n"
+            )
+        parts.append(
+            "REMARK   5 This is usually due to the fact that this residue "
+            "is not\n"
+            "REMARK   5 an amino acid or nucleic acid; or, there are no "
+            "parameters\n"
+            "REMARK   5 available for the specific protonation state of "
+            "this\n"
+            "REMARK   5 residue in the selected forcefield.\n"
+            "REMARK   5\n"
         )
     if len(reslist) != 0:
-        head += "\n".join(
-            [
-                "REMARK   5 WARNING: Non-integral net charges were found in",
-                "REMARK   5 the following residues:",
-                "",
-            ]
+        parts.append(
+            "REMARK   5 WARNING: Non-integral net charges were found in\n"
+            "REMARK   5 the following residues:\n"
         )
         for residue in reslist:
-            head += f"REMARK   5    {residue} - "
-            head += f"Residue Charge: {residue.charge:.4f}\n"
-        head += "REMARK   5\n"
-    head += "\n".join(
-        [
-            f"REMARK   6 Total charge on this biomolecule: {charge:.4f} e\n"
-            "REMARK   6",
-            "",
-        ]
+            parts.append(
+                f"REMARK   5    {residue} - "
+                f"Residue Charge: {residue.charge:.4f}\n"
+            )
+        parts.append("REMARK   5\n")
+    parts.append(
+        f"REMARK   6 Total charge on this biomolecule: {charge:.4f} e\n"
+        "REMARK   6\n"
     )
     if include_old_header:
-        head += "\n".join(
-            ["REMARK   7 Original PDB header follows", "REMARK   7", ""]
-        )
-        head += get_old_header(pdblist)
-    return head
+        parts.append("REMARK   7 Original PDB header follows\nREMARK   7\n")
+        parts.append(get_old_header(pdblist))
+    return "".join(parts)
 
 
 def print_pqr_header_cif(
@@ -245,87 +263,74 @@ def print_pqr_header_cif(
     else:
         force_field = force_field.upper()
 
-    header = "\n".join(
-        [
-            "#",
-            "loop_",
-            "_pdbx_database_remark.id",
-            "_pdbx_database_remark.text",
-            "1",
-            ";",
-            "PQR file generated by PDB2PQR",
-            TITLE_STR,
-            "",
-            f"Forcefield used: {force_field}\n" "",
-        ]
-    )
+    parts = [
+        "#\n",
+        "loop_\n",
+        "_pdbx_database_remark.id\n",
+        "_pdbx_database_remark.text\n",
+        "1\n",
+        ";\n",
+        "PQR file generated by PDB2PQR\n",
+        f"{TITLE_STR}\n",
+        "\n",
+        f"Forcefield used: {force_field}\n",
+    ]
     if ffout is not None:
-        header += f"Naming scheme used: {ffout}\n"
-    header += "\n"
+        parts.append(f"Naming scheme used: {ffout}\n")
+    parts.append("\n")
     if ph_calc_method is not None:
-        header += f"pKas calculated by {ph_calc_method} and "
-        header += f"assigned using pH {ph:.2f}\n"
-    header += "\n".join([";", "2", ";", ""])
+        parts.append(
+            f"pKas calculated by {ph_calc_method} and "
+            f"assigned using pH {ph:.2f}\n"
+        )
+    parts.append(";\n2\n;\n")
     if len(atomlist) > 0:
-        header += "\n".join(
-            [
-                "Warning: PDB2PQR was unable to assign charges",
-                "to the following atoms (omitted below):",
-                "",
-            ]
+        parts.append(
+            "Warning: PDB2PQR was unable to assign charges\n"
+            "to the following atoms (omitted below):\n"
         )
         for atom in atomlist:
-            header += f"    {atom.serial} {atom.name} in "
-            header += f"{atom.residue.name} {atom.residue.res_seq}\n"
-        header += "\n".join(
-            [
-                "This is usually due to the fact that this residue is not",
-                "an amino acid or nucleic acid; or, there are no parameters",
-                "available for the specific protonation state of this",
-                "residue in the selected forcefield.",
-                "",
-            ]
+            parts.append(
+                f"    {atom.serial} {atom.name} in "
+                f"{atom.residue.name} {atom.residue.res_seq}\n"
+            )
+        parts.append(
+            "This is usually due to the fact that this residue is not\n"
+            "an amino acid or nucleic acid; or, there are no parameters\n"
+            "available for the specific protonation state of this\n"
+            "residue in the selected forcefield.\n"
         )
     if len(reslist) > 0:
-        header += "\n".join(
-            [
-                "Warning: Non-integral net charges were found in",
-                "the following residues:",
-                "",
-            ]
+        parts.append(
+            "Warning: Non-integral net charges were found in\n"
+            "the following residues:\n"
         )
         for residue in reslist:
-            header += f"    {residue} - "
-            header += f"Residue Charge: {residue.charge:.4f}\n"
-    header += "\n".join(
-        [
-            ";",
-            "3",
-            ";",
-            f"Total charge on this biomolecule: {charge:.4f} e" ";",
-            "",
-        ]
+            parts.append(
+                f"    {residue} - Residue Charge: {residue.charge:.4f}\n"
+            )
+    parts.append(
+        f";\n3\n;\nTotal charge on this biomolecule: {charge:.4f} e;\n"
     )
     if include_old_header:
         _LOGGER.warning("Including original CIF header not implemented.")
-    header += "\n".join(
+    parts.extend(
         [
-            "#",
-            "loop_",
-            "_atom_site.group_PDB",
-            "_atom_site.id",
-            "_atom_site.label_atom_id",
-            "_atom_site.label_comp_id",
-            "_atom_site.label_seq_id",
-            "_atom_site.Cartn_x",
-            "_atom_site.Cartn_y",
-            "_atom_site.Cartn_z",
-            "_atom_site.pqr_partial_charge",
-            "_atom_site.pqr_radius",
-            "",
+            "#\n",
+            "loop_\n",
+            "_atom_site.group_PDB\n",
+            "_atom_site.id\n",
+            "_atom_site.label_atom_id\n",
+            "_atom_site.label_comp_id\n",
+            "_atom_site.label_seq_id\n",
+            "_atom_site.Cartn_x\n",
+            "_atom_site.Cartn_y\n",
+            "_atom_site.Cartn_z\n",
+            "_atom_site.pqr_partial_charge\n",
+            "_atom_site.pqr_radius\n",
         ]
     )
-    return header
+    return "".join(parts)
 
 
 def dump_apbs(output_pqr, output_path):
@@ -344,9 +349,16 @@ def dump_apbs(output_pqr, output_path):
     input_.print_input_files(output_path)
 
 
+@functools.lru_cache(maxsize=256)
 def test_for_file(name, type_):
     """Test for the existence of a file with a few name permutations.
 
+    Names are resolved relative to :data:`DAT_PATH`; an absolute path or a
+    name with a directory part is probed on the filesystem, while a bare
+    file name is checked against the listing of :data:`DAT_PATH` taken at
+    import.  Results are cached since these files do not change during a
+    run.
+
     :param name:  name of file
     :type name:  str
     :param type_:  type of file
@@ -357,22 +369,23 @@ def test_for_file(name, type_):
     """
     if name is None:
         return ""
-    test_names = [name, name.upper(), name.lower()]
-    test_suffixes = ["", f".{type_.upper()}", f".{type_.lower()}"]
-
-    module_path = Path(__file__)
-    dirpath_dat = module_path.parent / 'dat'
-
-    assert dirpath_dat.is_dir()
-
+    # Unique candidate names, starting with the exact name
+    test_names = dict.fromkeys(
+        test_name + test_suffix
+        for test_name in (name, name.upper(), name.lower())
+        for test_suffix in ("", f".{type_.upper()}", f".{type_.lower()}")
+    )
     if name.lower() in FORCE_FIELDS:
         name = name.upper()
     for test_name in test_names:
-        for test_suffix in test_suffixes:
-            test_path = dirpath_dat / (test_name + test_suffix)
-            if test_path.is_file():
-                _LOGGER.debug(f"Found {type_} file {test_path}")
-                return test_path
+        test_path = DAT_PATH / test_name
+        if Path(test_name).name == test_name:
+            found = test_name in _DAT_FILES
+        else:
+            found = test_path.is_file()
+        if found:
+            _LOGGER.debug(f"Found {type_} file {test_path}")
+            return test_path
     err = f"Unable to find {type_} file for {name}"
     raise FileNotFoundError(err)
 
@@ -433,11 +446,18 @@ def get_pdb_file(name):
         return open(path, "rt", encoding="utf-8")
     url_path = f"https://files.rcsb.org/download/{path.stem}.pdb"
     _LOGGER.debug(f"Attempting to fetch PDB from {url_path}")
-    resp = requests.get(url_path)
+    resp = _SESSION.get(url_path, stream=True, timeout=_DOWNLOAD_TIMEOUT)
     if resp.status_code != 200:
+        resp.close()
         errstr = f"Got code {resp.status_code} while retrieving {url_path}"
         raise IOError(errstr)
-    return io.StringIO(resp.text)
+    # Stream the response body rather than buffering it in memory; any
+    # Content-Encoding (e.g., gzip) is decoded on the fly.  urllib3 would
+    # otherwise close the raw stream as soon as the body is exhausted, before
+    # the text wrapper has handed out its buffered lines.
+    resp.raw.decode_content = True
+    resp.raw.auto_close = False
+    return io.TextIOWrapper(resp.raw, encoding="utf-8")
 
 
 def get_molecule(input_path):
@@ -453,12 +473,14 @@ def get_molecule(input_path):
     path = Path(input_path)
     input_file = get_pdb_file(input_path)
     is_cif = False
-    if path.suffix.lower() == ".cif":
-        pdblist, errlist = cif.read_cif(input_file)
-        is_cif = True
-    else:
-        pdblist, errlist = pdb.read_pdb(input_file)
-    input_file.close()
+    # Downloads are read straight from the connection, which must be closed
+    # even if parsing fails
+    with input_file:
+        if path.suffix.lower() == ".cif":
+            pdblist, errlist = cif.read_cif(input_file)
+            is_cif = True
+        else:
+            pdblist, errlist = pdb.read_pdb(input_file)
     if len(pdblist) == 0 and len(errlist) == 0:
         raise RuntimeError(f"Unable to find file {path}!")
     if len(errlist) != 0:
@@ -484,15 +506,20 @@ def get_definitions(
     :return:  topology Definitions object.
     :rtype:  Definition
     """
-    aa_path_ = test_xml_file(aa_path)
-    na_path_ = test_xml_file(na_path)
-    patch_path_ = test_xml_file(patch_path)
-    with open(aa_path_, "rt") as aa_file:
-        with open(na_path_, "rt") as na_file:
-            with open(patch_path_, "rt") as patch_file:
-                definitions = defns.Definition(
-                    aa_file=aa_file, na_file=na_file, patch_file=patch_file
-                )
+    def_paths = [
+        Path(test_xml_file(path)) for path in (aa_path, na_path, patch_path)
+    ]
+    # The reads are independent, so overlap them; the SAX parser consumes
+    # bytes directly, so skip text decoding
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        aa_bytes, na_bytes, patch_bytes = executor.map(
+            Path.read_bytes, def_paths
+        )
+    definitions = defns.Definition(
+        aa_file=io.BytesIO(aa_bytes),
+        na_file=io.BytesIO(na_bytes),
+        patch_file=io.BytesIO(patch_bytes),
+    )
     return definitions
 
 
@@ -542,6 +569,43 @@ def read_pqr(pqr_file):
     return atoms
 
 
+def read_pqr_arrays(pqr_file):
+    """Read PQR file into per-field arrays.
+
+    This is a structure-of-arrays alternative to :func:`read_pqr` for
+    consumers that only need atom names, coordinates, charges, and radii; no
+    :class:`Atom` objects are created.
+
+    :param pqr_file:  file object ready for reading as text
+    :type pqr_file:  file
+    :returns:  dictionary of arrays with keys ``serial``, ``name``, ``x``,
+        ``y``, ``z``, ``charge``, and ``radius``; element ``i`` of each array
+        describes the ``i``-th atom in the file
+    :rtype:  {str: numpy.ndarray}
+    :raises ValueError:  for problems parsing
+    """
+    serials = []
+    names = []
+    values = []
+    for line in pqr_file:
+        fields = split_pqr_line(line)
+        if fields is None:
+            continue
+        serials.append(fields[1])
+        names.append(fields[2])
+        values.append(fields[7])
+    values = np.array(values, dtype=np.float64).reshape(-1, 5)
+    return {
+        "serial": np.array(serials, dtype=np.int32),
+        "name": np.array(names, dtype=str),
+        "x": values[:, 0].copy(),
+        "y": values[:, 1].copy(),
+        "z": values[:, 2].copy(),
+        "charge": values[:, 3].copy(),
+        "radius": values[:, 4].copy(),
+    }
+
+
 def read_qcd(qcd_file):
     """Read QCD (UHDB QCARD format) file.
 
@@ -572,42 +636,81 @@ def read_dx(dx_file):
 
     :param dx_file:  file object for DX file, ready for reading as text
     :type dx_file:  file
-    :returns:  dictionary with data from DX file
+    :returns:  dictionary with data from DX file; the grid values are
+        stored as a one-dimensional :class:`numpy.ndarray`
     :rtype:  dict
     :raises ValueError:  on parsing error
     """
     dx_dict = {
         "grid spacing": [],
-        "values": [],
+        "values": None,
         "number of grid points": None,
         "lower left corner": None,
     }
+    # Metadata precedes the values; the first line that is not metadata
+    # starts the values, which are then parsed in bulk.
+    chunks = []
     for line in dx_file:
-        words = [w.strip() for w in line.split()]
-        if words[0] in ["#", "attribute", "component"]:
-            pass
-        elif words[0] == "object":
-            if words[1] == "1":
-                dx_dict["number of grid points"] = (
-                    int(words[5]),
-                    int(words[6]),
-                    int(words[7]),
-                )
-        elif words[0] == "origin":
-            dx_dict["lower left corner"] = [
-                float(words[1]),
-                float(words[2]),
-                float(words[3]),
-            ]
-        elif words[0] == "delta":
-            spacing = [float(words[1]), float(words[2]), float(words[3])]
-            dx_dict["grid spacing"].append(spacing)
-        else:
-            for word in words:
-                dx_dict["values"].append(float(word))
+        if not _read_dx_metadata(line.split(), dx_dict):
+            chunks.append(line)
+            break
+    chunks.append(dx_file.read())
+    text = "".join(chunks)
+    words = []
+    match = _DX_TRAILER.search(text)
+    if match is not None:
+        trailer_start = match.start()
+        for line in text[trailer_start:].splitlines():
+            line_words = line.split()
+            if line_words and not _read_dx_metadata(line_words, dx_dict):
+                words += line_words
+        text = text[:trailer_start]
+    # Unlike np.fromstring, this raises on any unparseable value
+    values = np.array(text.split() + words, dtype=np.float64)
+    num_points = dx_dict["number of grid points"]
+    if num_points is not None and values.size != np.prod(num_points):
+        err = (
+            f"Read {values.size} DX values but expected "
+            f"{num_points[0]}x{num_points[1]}x{num_points[2]}"
+        )
+        raise ValueError(err)
+    dx_dict["values"] = values
     return dx_dict
 
 
+def _read_dx_metadata(words, dx_dict):
+    """Store metadata from a DX line in the dictionary.
+
+    :param words:  whitespace-separated words from the line
+    :type words:  [str]
+    :param dx_dict:  dictionary for DX data, as built by :func:`read_dx`
+    :type dx_dict:  dict
+    :returns:  False if the line does not contain metadata (e.g., values)
+    :rtype:  bool
+    """
+    if words[0] in ["#", "attribute", "component"]:
+        pass
+    elif words[0] == "object":
+        if words[1] == "1":
+            dx_dict["number of grid points"] = (
+                int(words[5]),
+                int(words[6]),
+                int(words[7]),
+            )
+    elif words[0] == "origin":
+        dx_dict["lower left corner"] = [
+            float(words[1]),
+            float(words[2]),
+            float(words[3]),
+        ]
+    elif words[0] == "delta":
+        spacing = [float(words[1]), float(words[2]), float(words[3])]
+        dx_dict["grid spacing"].append(spacing)
+    else:
+        return False
+    return True
+
+
 def write_cube(cube_file, data_dict, atom_list, comment="CPMD CUBE FILE."):
     """Write a Cube-format data file.
 
@@ -616,7 +719,9 @@ def write_cube(cube_file, data_dict, atom_list, comment="CPMD CUBE FILE."):
 
     .. todo:: This function should be moved into the APBS code base.
 
-    :param cube_file:  file object ready for writing text data
+    :param cube_file:  file object ready for writing text data; values are
+        written in blocks of several megabytes, so a larger buffer than the
+        default does not reduce the number of system calls
     :type cube_file:  file
     :param data_dict:  dictionary of volumetric data as produced by
         :func:`read_dx`
@@ -624,35 +729,45 @@ def write_cube(cube_file, data_dict, atom_list, comment="CPMD CUBE FILE."):
     :param comment:  comment for Cube file
     :type comment:  str
     """
-    cube_file.write(comment + "\n")
-    cube_file.write("OUTER LOOP: X, MIDDLE LOOP: Y, INNER LOOP: Z\n")
     num_atoms = len(atom_list)
     origin = data_dict["lower left corner"]
-    cube_file.write(
-        f"{num_atoms:>4} {origin[0]:>11.6f} {origin[1]:>11.6f} "
-        f"{origin[2]:>11.6f}\n"
-    )
     num_points = data_dict["number of grid points"]
     spacings = data_dict["grid spacing"]
+    lines = [
+        comment,
+        "OUTER LOOP: X, MIDDLE LOOP: Y, INNER LOOP: Z",
+        f"{num_atoms:>4} {origin[0]:>11.6f} {origin[1]:>11.6f} "
+        f"{origin[2]:>11.6f}",
+    ]
     for i in range(3):
-        cube_file.write(
+        lines.append(
             f"{-num_points[i]:>4} "
             f"{spacings[i][0]:>11.6f} "
             f"{spacings[i][1]:>11.6f} "
-            f"{spacings[i][2]:>11.6f}\n"
+            f"{spacings[i][2]:>11.6f}"
         )
     for atom in atom_list:
-        cube_file.write(
+        lines.append(
             f"{atom.serial:>4} {atom.charge:>11.6f} {atom.x:>11.6f} "
-            f"{atom.y:>11.6f} {atom.z:>11.6f}\n"
+            f"{atom.y:>11.6f} {atom.z:>11.6f}"
         )
+    cube_file.write("\n".join(lines) + "\n")
+    # Values are written six per line; the last line is not terminated.
+    # Lines are formatted and written in large blocks to keep the number of
+    # writes small without holding the whole text of the grid in memory.
     stride = 6
-    values = data_dict["values"]
-    for i in range(0, len(values), 6):
-        if i + stride < len(values):
-            imax = i + 6
-            words = [f"{val:< 13.5E}" for val in values[i:imax]]
-            cube_file.write(" ".join(words) + "\n")
-        else:
-            words = [f"{val:< 13.5E}" for val in values[i:]]
-            cube_file.write(" ".join(words))
+    values = np.asarray(data_dict["values"], dtype=np.float64)
+    num_full = (values.size // stride) * stride
+    full_rows = values[:num_full].reshape(-1, stride)
+    row_fmt = " ".join(["% -13.5E"] * stride)
+    separator = ""
+    for start in range(0, len(full_rows), _CUBE_ROWS_PER_WRITE):
+        stop = start + _CUBE_ROWS_PER_WRITE
+        block = full_rows[start:stop].tolist()
+        rows = [row_fmt % row for row in map(tuple, block)]
+        cube_file.write(separator + "\n".join(rows))
+        separator = "\n"
+    remainder = values[num_full:].tolist()
+    if remainder:
+        rows = " ".join(["% -13.5E"] * len(remainder)) % tuple(remainder)
+        cube_file.write(separator + rows)
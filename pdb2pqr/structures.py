@@ -10,6 +10,114 @@ associated methods.
 from .config import BACKBONE
 
 
+#: Record names that carry no atom data in PQR/QCD files
+NON_ATOM_RECORDS = frozenset(
+    [
+        "REMARK",
+        "TER",
+        "END",
+        "HEADER",
+        "TITLE",
+        "COMPND",
+        "SOURCE",
+        "KEYWDS",
+        "EXPDTA",
+        "AUTHOR",
+        "REVDAT",
+        "JRNL",
+    ]
+)
+
+
+def split_atom_record(line):
+    """Split an ATOM/HETATM line into its record type and remaining fields.
+
+    Record names that run into the serial number (e.g., ``HETATM12345``) are
+    split apart.
+
+    :param line:  PQR or QCD line
+    :type line:  str
+    :returns:  record type and the whitespace-separated fields that follow
+        it, or None (for REMARK and similar lines)
+    :rtype:  (str, [str])
+    :raises ValueError:  for problems parsing
+    """
+    words = line.split()
+    token = words[0]
+    if token in NON_ATOM_RECORDS:
+        return None
+    if token == "ATOM" or token == "HETATM":
+        return token, words[1:]
+    if token[:4] == "ATOM":
+        words[0] = token[4:]
+        return "ATOM", words
+    if token[:6] == "HETATM":
+        words[0] = token[6:]
+        return "HETATM", words
+    err = f"Unable to parse line: {line}"
+    raise ValueError(err)
+
+
+def split_pqr_line(line):
+    """Split a PQR ATOM/HETATM line into its fields by position.
+
+    The chain ID and insertion code are optional and shift the position of
+    the fields that follow them; any fields after the radius are ignored.
+
+    :param line:  PQR line
+    :type line:  str
+    :returns:  record type, serial, atom name, residue name, chain ID (or
+        None), residue number, insertion code (or None), and the unconverted
+        x, y, z, charge, and radius fields; or None (for REMARK and similar
+        lines)
+    :rtype:  (str, int, str, str, str, int, str, [str])
+    :raises ValueError:  for problems parsing
+    """
+    record = split_atom_record(line)
+    if record is None:
+        return None
+    record_type, words = record
+    chain_id = None
+    ins_code = None
+    idx = 3
+    try:
+        res_seq = int(words[idx])
+    except ValueError:
+        chain_id = words[idx]
+        idx += 1
+        res_seq = int(words[idx])
+    idx += 1
+    try:
+        float(words[idx])
+    except ValueError:
+        ins_code = words[idx]
+        idx += 1
+    end = idx + 5
+    values = words[idx:end]
+    if len(values) != 5:
+        err = f"Unable to parse line: {line}"
+        raise ValueError(err)
+    return (
+        record_type,
+        int(words[0]),
+        words[1],
+        words[2],
+        chain_id,
+        res_seq,
+        ins_code,
+        values,
+    )
+
+
+#: Format for the columns shared by PDB and PQR ATOM/HETATM records: record
+#: name, serial, atom name, residue name, chain ID, residue number, insertion
+#: code, and coordinates
+_COMMON_FORMAT = "%-6.6s%5.5s %s%s %-1.1s%4.4s%s%s"
+
+#: Format for a PQR ATOM/HETATM record: common columns, charge, and radius
+_PQR_FORMAT = "%s%8.8s%7.7s"
+
+
 class Chain:
     """Chain class
 
@@ -151,54 +259,21 @@ class Atom:
         :rtype:  Atom
         :raises ValueError:  for problems parsing
         """
-        atom = cls()
-        words = [w.strip() for w in line.split()]
-        token = words.pop(0)
-        if token in [
-            "REMARK",
-            "TER",
-            "END",
-            "HEADER",
-            "TITLE",
-            "COMPND",
-            "SOURCE",
-            "KEYWDS",
-            "EXPDTA",
-            "AUTHOR",
-            "REVDAT",
-            "JRNL",
-        ]:
+        fields = split_pqr_line(line)
+        if fields is None:
             return None
-        if token in ["ATOM", "HETATM"]:
-            atom.type = token
-        elif token[:4] == "ATOM":
-            atom.type = "ATOM"
-            words = [token[4:]] + words
-        elif token[:6] == "HETATM":
-            atom.type = "HETATM"
-            words = [token[6:]] + words
-        else:
-            err = f"Unable to parse line: {line}"
-            raise ValueError(err)
-        atom.serial = int(words.pop(0))
-        atom.name = words.pop(0)
-        atom.res_name = words.pop(0)
-        token = words.pop(0)
-        try:
-            atom.res_seq = int(token)
-        except ValueError:
-            atom.chain_id = token
-            atom.res_seq = int(words.pop(0))
-        token = words.pop(0)
-        try:
-            atom.x = float(token)
-        except ValueError:
-            atom.ins_code = token
-            atom.x = float(words.pop(0))
-        atom.y = float(words.pop(0))
-        atom.z = float(words.pop(0))
-        atom.charge = float(words.pop(0))
-        atom.radius = float(words.pop(0))
+        atom = cls()
+        (
+            atom.type,
+            atom.serial,
+            atom.name,
+            atom.res_name,
+            atom.chain_id,
+            atom.res_seq,
+            atom.ins_code,
+            values,
+        ) = fields
+        atom.x, atom.y, atom.z, atom.charge, atom.radius = map(float, values)
         return atom
 
     @classmethod
@@ -212,44 +287,20 @@ class Atom:
         :rtype:  Atom
         :raises ValueError:  for problems parsing
         """
-        atom = cls()
-        words = [w.strip() for w in line.split()]
-        token = words.pop(0)
-        if token in [
-            "REMARK",
-            "TER",
-            "END",
-            "HEADER",
-            "TITLE",
-            "COMPND",
-            "SOURCE",
-            "KEYWDS",
-            "EXPDTA",
-            "AUTHOR",
-            "REVDAT",
-            "JRNL",
-        ]:
+        record = split_atom_record(line)
+        if record is None:
             return None
-        if token in ["ATOM", "HETATM"]:
-            atom.type = token
-        elif token[:4] == "ATOM":
-            atom.type = "ATOM"
-            words = [token[4:]] + words
-        elif token[:6] == "HETATM":
-            atom.type = "HETATM"
-            words = [token[6:]] + words
-        else:
-            err = f"Unable to parse line: {line}"
-            raise ValueError(err)
+        atom = cls()
+        atom.type, words = record
         atom.serial = int(atom_serial)
-        atom.res_seq = int(words.pop(0))
-        atom.res_name = words.pop(0)
-        atom.name = words.pop(0)
-        atom.x = float(words.pop(0))
-        atom.y = float(words.pop(0))
-        atom.z = float(words.pop(0))
-        atom.charge = float(words.pop(0))
-        atom.radius = float(words.pop(0))
+        atom.res_seq = int(words[0])
+        atom.res_name = words[1]
+        atom.name = words[2]
+        atom.x = float(words[3])
+        atom.y = float(words[4])
+        atom.z = float(words[5])
+        atom.charge = float(words[6])
+        atom.radius = float(words[7])
         return atom
 
     def get_common_string_rep(self, chainflag=False):
@@ -262,35 +313,37 @@ class Atom:
         :return:  string with ATOM/HETATM field set appropriately
         :rtype:  str
         """
-        outstr = ""
-        tstr = self.type
-        outstr += str.ljust(tstr, 6)[:6]
-        tstr = f"{self.serial:d}"
-        outstr += str.rjust(tstr, 5)[:5]
-        outstr += " "
-        tstr = self.name
-        if len(tstr) == 4 or len(tstr.strip("FLIP")) == 4:
-            outstr += str.ljust(tstr, 4)[:4]
+        name = self.name
+        if len(name) == 4 or len(name.strip("FLIP")) == 4:
+            name = "%-4.4s" % name
         else:
-            outstr += " " + str.ljust(tstr, 3)[:3]
-        tstr = self.res_name
-        if len(tstr) == 4:
-            outstr += str.ljust(tstr, 4)[:4]
+            name = " %-3.3s" % name
+        res_name = self.res_name
+        if len(res_name) == 4:
+            res_name = "%-4.4s" % res_name
         else:
-            outstr += " " + str.ljust(tstr, 3)[:3]
-        outstr += " "
-        tstr = self.chain_id if chainflag else ""
-        outstr += str.ljust(tstr, 1)[:1]
-        tstr = f"{self.res_seq:d}"
-        outstr += str.rjust(tstr, 4)[:4]
-        outstr += f"{self.ins_code}   " if self.ins_code != "" else "    "
-        tstr = f"{self.x:8.3f}"
-        outstr += str.ljust(tstr, 8)[:8]
-        tstr = f"{self.y:8.3f}"
-        outstr += str.ljust(tstr, 8)[:8]
-        tstr = f"{self.z:8.3f}"
-        outstr += str.ljust(tstr, 8)[:8]
-        return outstr
+            res_name = " %-3.3s" % res_name
+        coords = "%8.3f%8.3f%8.3f" % (self.x, self.y, self.z)
+        if len(coords) != 24:
+            # Truncate coordinates that overflow their 8-column fields
+            coords = "".join(
+                [("%8.3f" % coord)[:8] for coord in (self.x, self.y, self.z)]
+            )
+        chain_id = self.chain_id if chainflag else ""
+        if not isinstance(chain_id, str):
+            # "%s" would quietly write str(chain_id), e.g. "N" for None
+            err = f"Chain ID must be a string, not {chain_id!r}"
+            raise TypeError(err)
+        return _COMMON_FORMAT % (
+            self.type,
+            f"{self.serial:d}",
+            name,
+            res_name,
+            chain_id,
+            f"{self.res_seq:d}",
+            f"{self.ins_code}   " if self.ins_code != "" else "    ",
+            coords,
+        )
 
     def __str__(self):
         return self.get_pqr_string()
@@ -305,16 +358,17 @@ class Atom:
         :return:  string with ATOM/HETATM field set appropriately
         :rtype:  str
         """
-        outstr = self.get_common_string_rep(chainflag=chainflag)
         ffcharge = (
             f"{self.ffcharge:.4f}" if self.ffcharge is not None else "0.0000"
         )
-        outstr += str.rjust(ffcharge, 8)[:8]
         ffradius = (
             f"{self.radius:.4f}" if self.radius is not None else "0.0000"
         )
-        outstr += str.rjust(ffradius, 7)[:7]
-        return outstr
+        return _PQR_FORMAT % (
+            self.get_common_string_rep(chainflag=chainflag),
+            ffcharge,
+            ffradius,
+        )
 
     def get_pdb_string(self):
         """Returns a string of the atom type.
@@ -74,6 +74,7 @@ setup(
             "flake8",
             "pandas >= 1.0",
             "pytest",
+            "pytest-xdist",
             "testfixtures",
         ],
     },
@@ -58,7 +58,7 @@ for ff in ["CHARMM", "AMBER", "PARSE", "SWANSON", "TYL06"]:
 # fmt: on
 
 
-@pytest.mark.parametrize("input_pdb", list(SHORT_SET), ids=str)
+@pytest.mark.parametrize("input_pdb", sorted(SHORT_SET), ids=str)
 def test_short_pdb(input_pdb, tmp_path):
     """Non-regression tests on short list of PDB-format biomolecules."""
     args = "--log-level=INFO --ff=AMBER --drop-water --apbs-input=apbs.in"
@@ -71,7 +71,7 @@ def test_short_pdb(input_pdb, tmp_path):
     )
 
 
-@pytest.mark.parametrize("input_pdb", list(SHORT_SET), ids=str)
+@pytest.mark.parametrize("input_pdb", sorted(SHORT_SET), ids=str)
 def test_basic_cif(input_pdb, tmp_path):
     """Non-regression tests on short list of CIF-format biomolecules."""
     args = "--log-level=INFO --ff=AMBER --drop-water --apbs-input=apbs.in"
@@ -84,7 +84,7 @@ def test_basic_cif(input_pdb, tmp_path):
     )
 
 
-@pytest.mark.parametrize("input_pdb", list(LONG_SET), ids=str)
+@pytest.mark.parametrize("input_pdb", sorted(LONG_SET), ids=str)
 @pytest.mark.long_test
 def test_long_pdb(input_pdb, tmp_path):
     """Non-regression tests on short list of PDB-format biomolecules."""
@@ -98,7 +98,7 @@ def test_long_pdb(input_pdb, tmp_path):
     )
 
 
-@pytest.mark.parametrize("input_pdb", list(BROKEN_SET), ids=str)
+@pytest.mark.parametrize("input_pdb", sorted(BROKEN_SET), ids=str)
 @pytest.mark.xfail
 def test_broken_backbone(input_pdb, tmp_path):
     """Test graceful failure of optimization with missing backbone atoms."""
@@ -1,14 +1,107 @@
 """Tests of I/O functions."""
+import gzip
 import logging
+import threading
 from difflib import Differ
+from io import StringIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+import numpy as np
 import pytest
+import requests
+from pdb2pqr import io as pdb2pqr_io
+from pdb2pqr import pdb
 from pdb2pqr.io import read_pqr, read_dx, write_cube, read_qcd
+from pdb2pqr.io import read_pqr_arrays, print_pqr_header
 
 
 _LOGGER = logging.getLogger(__name__)
 DATA_DIR = Path("tests/data")
 PQR_LIST = list(DATA_DIR.glob("**/*.pqr"))
+REMOTE_PDB = DATA_DIR / "1AFS.pdb"
+DX_HEADER = (
+    "object 1 class gridpositions counts 2 2 1\n"
+    "origin 0.0 0.0 0.0\n"
+    "delta 1.0 0.0 0.0\n"
+)
+
+
+class PDBRequestHandler(BaseHTTPRequestHandler):
+    """Serve :data:`REMOTE_PDB` for every GET request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        """Send the PDB file, gzip-encoded if the server asks for it."""
+        self.server.client_ports.append(self.client_address[1])
+        body = REMOTE_PDB.read_bytes()
+        self.send_response(200)
+        if self.server.use_gzip:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep the test log quiet."""
+
+
+class LocalSession(requests.Session):
+    """Session that sends every GET to a local server."""
+
+    def __init__(self, local_url):
+        super().__init__()
+        self.local_url = local_url
+
+    def get(self, url, **kwargs):
+        """Fetch :attr:`local_url` instead of ``url``."""
+        return super().get(self.local_url, **kwargs)
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "gzip"])
+def pdb_server(request, monkeypatch):
+    """Serve :data:`REMOTE_PDB` locally in place of the RCSB server.
+
+    :returns:  the running server
+    :rtype:  ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PDBRequestHandler)
+    server.daemon_threads = True
+    server.use_gzip = request.param
+    server.client_ports = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    session = LocalSession(f"http://127.0.0.1:{server.server_port}/")
+    monkeypatch.setattr(pdb2pqr_io, "_SESSION", session)
+    yield server
+    session.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("ffout", [None, "AMBER"], ids=str)
+def test_print_pqr_header(ffout):
+    """Test that :func:`print_pqr_header` writes its title block once.
+
+    :param ffout:  forcefield used for naming scheme
+    :type ffout:  str
+    """
+    header = print_pqr_header(
+        pdblist=[],
+        atomlist=[],
+        reslist=[],
+        charge=0.0,
+        force_field="amber",
+        ph_calc_method=None,
+        ph=None,
+        ffout=ffout,
+    )
+    lines = header.splitlines()
+    assert lines.count("REMARK   1 PQR file generated by PDB2PQR") == 1
+    assert lines.count("REMARK   1 Forcefield Used: AMBER") == 1
+    if ffout is not None:
+        assert lines.count(f"REMARK   1 Naming Scheme Used: {ffout}") == 1
 
 
 @pytest.mark.parametrize("input_pqr", PQR_LIST, ids=str)
@@ -25,6 +118,107 @@ def test_read_pqr(input_pqr):
         read_pqr(pqr_file)
 
 
+@pytest.mark.parametrize("input_pqr", PQR_LIST, ids=str)
+def test_read_pqr_arrays(input_pqr):
+    """Test that :func:`read_pqr_arrays` matches :func:`read_pqr`.
+
+    :param input_pqr:  path to PQR file to test
+    :type input_pqr:  str
+    """
+    with open(input_pqr, "rt") as pqr_file:
+        atoms = read_pqr(pqr_file)
+    with open(input_pqr, "rt") as pqr_file:
+        arrays = read_pqr_arrays(pqr_file)
+    for key in ["serial", "name", "x", "y", "z", "charge", "radius"]:
+        expected = [getattr(atom, key) for atom in atoms]
+        np.testing.assert_array_equal(arrays[key], expected)
+
+
+def test_read_pqr_arrays_extra_columns():
+    """Test that :func:`read_pqr_arrays` parses fields by position."""
+    pqr_text = (
+        "REMARK   1 PQR file generated by PDB2PQR\n"
+        "ATOM      1  N   ALA A   1 A    -1.000   2.000   3.000 -0.3000 "
+        "1.8240 N 0.50\n"
+        "HETATM12345  O   HOH     2       4.000   5.000   6.000 -0.8340 "
+        "1.6612 extra\n"
+        "END\n"
+    )
+    atoms = read_pqr(StringIO(pqr_text))
+    arrays = read_pqr_arrays(StringIO(pqr_text))
+    assert len(atoms) == 2
+    assert (atoms[0].chain_id, atoms[0].ins_code) == ("A", "A")
+    assert atoms[1].serial == 12345
+    for key in ["serial", "name", "x", "y", "z", "charge", "radius"]:
+        expected = [getattr(atom, key) for atom in atoms]
+        np.testing.assert_array_equal(arrays[key], expected)
+    np.testing.assert_array_equal(arrays["radius"], [1.824, 1.6612])
+
+
+def test_pqr_string_without_chain():
+    """Test that a missing chain ID is never written as text."""
+    line = (
+        "ATOM      1  N   ALA     1      -1.000   2.000   3.000 -0.3000 "
+        "1.8240"
+    )
+    atom = read_pqr(StringIO(line))[0]
+    assert atom.chain_id is None
+    assert atom.get_pqr_string()[21] == " "
+    with pytest.raises(TypeError):
+        atom.get_pqr_string(chainflag=True)
+
+
+def test_get_pdb_file_remote(pdb_server):
+    """Test that a downloaded PDB file can be read to the end."""
+    with open(REMOTE_PDB, "rt") as pdb_file:
+        expected, _ = pdb.read_pdb(pdb_file)
+    pdb_file = pdb2pqr_io.get_pdb_file("1AFS")
+    pdblist, _ = pdb.read_pdb(pdb_file)
+    assert pdb_file.readline() == ""
+    pdb_file.close()
+    assert [str(obj) for obj in pdblist] == [str(obj) for obj in expected]
+
+
+def test_get_molecule_reuses_connection(pdb_server):
+    """Test that repeated downloads share one pooled connection."""
+    for _ in range(3):
+        pdblist, is_cif = pdb2pqr_io.get_molecule("1AFS")
+        assert len(pdblist) > 0
+        assert not is_cif
+    assert len(pdb_server.client_ports) == 3
+    assert len(set(pdb_server.client_ports)) == 1
+
+
+def test_get_molecule_closes_on_error(pdb_server, monkeypatch):
+    """Test that a download is closed when parsing it fails."""
+    opened = []
+
+    def get_pdb_file(name):
+        opened.append(get_pdb_file_orig(name))
+        return opened[-1]
+
+    def read_pdb(pdb_file):
+        raise ValueError("Unable to parse")
+
+    get_pdb_file_orig = pdb2pqr_io.get_pdb_file
+    monkeypatch.setattr(pdb2pqr_io, "get_pdb_file", get_pdb_file)
+    monkeypatch.setattr(pdb, "read_pdb", read_pdb)
+    with pytest.raises(ValueError):
+        pdb2pqr_io.get_molecule("1AFS")
+    assert opened[0].closed
+
+
+def test_get_definitions_outside_dat(tmp_path):
+    """Test that definition files outside the bundled directory are found."""
+    aa_path = tmp_path / "myAA.xml"
+    aa_path.write_bytes((pdb2pqr_io.DAT_PATH / "AA.xml").read_bytes())
+    assert pdb2pqr_io.test_xml_file(str(aa_path)) == aa_path
+    definition = pdb2pqr_io.get_definitions(aa_path=str(aa_path))
+    assert "ALA" in definition.map
+    with pytest.raises(FileNotFoundError):
+        pdb2pqr_io.test_xml_file(str(tmp_path / "missing.xml"))
+
+
 def test_read_qcd():
     """Test that :func:`read_pqr` doesn't raise an error.
 
@@ -35,6 +229,32 @@ def test_read_qcd():
         read_qcd(qcd_file)
 
 
+def test_read_dx_nonfinite():
+    """Test that :func:`read_dx` reads lines starting with ``nan``."""
+    dx_text = DX_HEADER + "nan 2.0 3.0\n4.0\n" + 'attribute "dep"\n'
+    dx_dict = read_dx(StringIO(dx_text))
+    np.testing.assert_array_equal(dx_dict["values"], [np.nan, 2.0, 3.0, 4.0])
+    dx_dict = read_dx(StringIO("nan 2.0 3.0\n-inf\n"))
+    np.testing.assert_array_equal(
+        dx_dict["values"], [np.nan, 2.0, 3.0, -np.inf]
+    )
+
+
+@pytest.mark.parametrize(
+    "dx_text",
+    [DX_HEADER + "1.0 2.0 x\n4.0\n", "1.0 2.0 x\n4.0\n", "1.0 #\n"],
+    ids=["counts", "no counts", "comment"],
+)
+def test_read_dx_bad_value(dx_text):
+    """Test that :func:`read_dx` raises on unparseable values.
+
+    :param dx_text:  contents of DX file
+    :type dx_text:  str
+    """
+    with pytest.raises(ValueError):
+        read_dx(StringIO(dx_text))
+
+
 def test_dx2cube(tmp_path):
     """Test conversion of OpenDX files to Cube files."""
     pqr_path = DATA_DIR / "dx2cube.pqr"
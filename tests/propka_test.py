@@ -3,10 +3,11 @@ from pathlib import Path
 import pytest
 import common
 
+#: Biomolecules without ligands used for PROPKA tests
+PROPKA_PDBS = ("1K1I", "1AFS", "1FAS", "5DV8", "5D8V")
 
-@pytest.mark.parametrize(
-    "input_pdb", ["1K1I", "1AFS", "1FAS", "5DV8", "5D8V"], ids=str
-)
+
+@pytest.mark.parametrize("input_pdb", PROPKA_PDBS, ids=str)
 def test_propka_apo(input_pdb, tmp_path):
     """PROPKA non-regression tests on biomolecules without ligands."""
     args = (
@@ -22,9 +23,7 @@ def test_propka_apo(input_pdb, tmp_path):
     )
 
 
-@pytest.mark.parametrize(
-    "input_pdb", ["1K1I", "1AFS", "1FAS", "5DV8", "5D8V"], ids=str
-)
+@pytest.mark.parametrize("input_pdb", PROPKA_PDBS, ids=str)
 def test_propka_pka(input_pdb):
     """PROPKA non-regression tests for pKa values on biomolecules without ligands."""
     output_csv = Path("tests/data") / f"{input_pdb}_pka.csv"